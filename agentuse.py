@@ -1,10 +1,17 @@
 import os
 import time
 import re
+import signal
 import subprocess
+import tempfile
+import threading
 from typing import Optional
 import openai
 
+# Keystrokes go to whichever Terminal window is frontmost, so agents running
+# side by side must not interleave their AppleScript calls.
+_terminal_lock = threading.RLock()
+
 def get_system_prompt(goal: Optional[str] = None, custom_tools=None, instructions=None):
     goal_text = f"\n\nGOAL: {goal}" if goal else ""
     base = f"""You are a PROJECT MANAGER directing a coding assistant. You make all decisions and give clear instructions.{goal_text}
@@ -60,6 +67,9 @@ def clean_output(text: str) -> str:
 
 class Driver:
     def __init__(self, cmd: str, directory: Optional[str] = None, clone_from: Optional[str] = None):
+        self.window_id = None
+        self.terminated = False
+
         # Handle cloning first if specified
         if clone_from and directory:
             self._clone_directory(clone_from, directory)
@@ -101,6 +111,10 @@ class Driver:
 
     def _start_terminal(self, cwd: str, cmd: str):
         """Start terminal in the specified directory"""
+        with _terminal_lock:
+            self._open_window(cwd, cmd)
+
+    def _open_window(self, cwd: str, cmd: str):
         script = f'''
         tell application "Terminal"
             activate
@@ -118,9 +132,10 @@ class Driver:
         time.sleep(2)
 
     def _type_and_enter(self, text: str):
-        if text:
-            self._type_text(text)
-        self._press_enter()
+        with _terminal_lock:
+            if text:
+                self._type_text(text)
+            self._press_enter()
         time.sleep(0.2)
 
     def _type_text(self, text: str):
@@ -150,9 +165,10 @@ class Driver:
         subprocess.run(["osascript", "-e", script], capture_output=True, text=True, check=False)
 
     def send_text(self, text: str):
-        if text:
-            self._type_text(text)
-        self._press_enter()
+        with _terminal_lock:
+            if text:
+                self._type_text(text)
+            self._press_enter()
         time.sleep(0.3)
 
     def read_screen(self) -> str:
@@ -167,8 +183,66 @@ class Driver:
     def close(self):
         pass
 
+    def _tab_query(self, prop: str) -> str:
+        script = f'''
+        tell application "Terminal"
+            get {prop} of selected tab of window id {self.window_id}
+        end tell
+        '''
+        result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True, check=False)
+        return result.stdout.strip()
+
+    def terminate(self):
+        """Interrupt the CLI and close the Terminal window, killing the tab's processes if the CLI will not quit"""
+        if self.terminated or not self.window_id:
+            return
+        self.terminated = True
+        interrupt = f'''
+        tell application "Terminal"
+            activate
+            set frontmost of window id {self.window_id} to true
+        end tell
+        tell application "System Events"
+            keystroke "c" using control down
+            delay 0.3
+            keystroke "c" using control down
+        end tell
+        '''
+        close_window = f'''
+        tell application "Terminal"
+            close window id {self.window_id}
+        end tell
+        '''
+        with _terminal_lock:
+            subprocess.run(["osascript", "-e", interrupt], capture_output=True, text=True, check=False)
+            time.sleep(0.5)
+            # Only type exit once the shell prompt is back; a CLI still at a prompt would take it as an instruction
+            if self._tab_query("busy") == "false":
+                self._type_and_enter("exit")
+                time.sleep(0.5)
+            else:
+                tty = self._tab_query("tty")
+                if tty:
+                    subprocess.run(["pkill", "-KILL", "-t", tty.replace("/dev/", "")], capture_output=True, text=True, check=False)
+            subprocess.run(["osascript", "-e", close_window], capture_output=True, text=True, check=False)
+
+class TokenBudget:
+    """Manager-model token allowance shared by several agents; trips once the limit is spent.
+    Tokens spent inside the controlled CLI are not visible here and are not counted."""
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def spend(self, tokens: int):
+        with self._lock:
+            self.used += tokens
+
+    def exhausted(self) -> bool:
+        return self.limit is not None and self.used >= self.limit
+
 class Agent:
-    def __init__(self, goal: str, driver: Driver, time_limit_minutes: Optional[int], client, custom_tools, model, provider_order, first_command: Optional[str] = None):
+    def __init__(self, goal: str, driver: Driver, time_limit_minutes: Optional[int], client, custom_tools, model, provider_order, first_command: Optional[str] = None, stop_event: Optional[threading.Event] = None, budget: Optional[TokenBudget] = None, session_dir: Optional[str] = None):
         self.goal = goal
         self.driver = driver
         self.client = client
@@ -187,6 +261,23 @@ class Agent:
         self.time_limit_minutes = time_limit_minutes
         self.last_screen_change_time = time.time()
         self.screen_stable_threshold = 0.5
+        self.stop_event = stop_event
+        self.budget = budget
+        self.tokens_used = 0
+        self.exited = False
+        self.session_dir = session_dir
+
+    def should_stop(self) -> bool:
+        if self.stop_event and self.stop_event.is_set():
+            return True
+        return bool(self.budget and self.budget.exhausted())
+
+    def record_usage(self, resp):
+        usage = getattr(resp, "usage", None)
+        tokens = getattr(usage, "total_tokens", 0) or 0
+        self.tokens_used += tokens
+        if self.budget:
+            self.budget.spend(tokens)
 
     def save_session(self, final_summary: str):
         """Save session details to agentuse.md for resuming"""
@@ -202,9 +293,10 @@ class Agent:
 ---
 
 """
+        path = os.path.join(self.session_dir, "agentuse.md") if self.session_dir else "agentuse.md"
         try:
             # Append to existing file or create new one
-            with open("agentuse.md", "a", encoding="utf-8") as f:
+            with open(path, "a", encoding="utf-8") as f:
                 f.write(content)
         except Exception as e:
             print(f"[Warning: Could not save session to agentuse.md: {e}]")
@@ -249,6 +341,7 @@ class Agent:
             temperature=0.3,
             extra_body=extra_body,
         )
+        self.record_usage(resp)
         return resp.choices[0].message.content.strip()
 
     def generate_final_summary(self) -> str:
@@ -263,6 +356,7 @@ class Agent:
             temperature=0.3,
             extra_body=extra_body,
         )
+        self.record_usage(resp)
         return resp.choices[0].message.content.strip()
 
     def ask_llm(self) -> str:
@@ -279,6 +373,7 @@ class Agent:
             temperature=0.7,
             extra_body=extra_body,
         )
+        self.record_usage(resp)
         return (resp.choices[0].message.content or "").strip()
 
     def get_time_status(self) -> str:
@@ -329,6 +424,10 @@ class Agent:
         time.sleep(2)
         
         while True:
+            if self.should_stop():
+                print("\n[Stopped - cancelled or budget exhausted]")
+                break
+
             current_screen = self.driver.read_screen()
             clean_screen = clean_output(current_screen)
 
@@ -379,6 +478,7 @@ class Agent:
                 continue
 
             if result == "exit":
+                self.exited = True
                 print("\n[Goal accomplished!]")
                 # Generate final summary
                 final_summary = self.generate_final_summary()
@@ -420,3 +520,88 @@ class AgentUse:
         agent.run()
         driver.close()
 
+    def run_fleet(self, goal: str, verifier, attempts: int = 3, cli_cmd: str = "claude", clone_from: Optional[str] = None, base_directory: Optional[str] = None, max_parallel: Optional[int] = None, token_budget: Optional[int] = None, time_limit: Optional[int] = None, first_command: Optional[str] = None, verifier_timeout: Optional[int] = 600):
+        """Run several attempts at one goal in cloned workspaces; the first attempt that passes the verifier wins and the rest are cancelled"""
+        base_directory = os.path.expanduser(base_directory) if base_directory else tempfile.mkdtemp(prefix="agentuse_fleet_")
+        stop_event = threading.Event()
+        budget = TokenBudget(token_budget)
+        slots = threading.Semaphore(max_parallel or attempts)
+        winner_lock = threading.Lock()
+        winner = {"directory": None}
+        results = [{"directory": os.path.join(base_directory, f"attempt_{i + 1}"), "status": "cancelled", "tokens": 0} for i in range(attempts)]
+
+        def run_attempt(result):
+            # The slot is held through verification so queued attempts wait for the verdict
+            with slots:
+                if stop_event.is_set() or budget.exhausted():
+                    return
+                directory = result["directory"]
+                driver = None
+                agent = None
+                try:
+                    os.makedirs(directory, exist_ok=True)
+                    driver = Driver(cli_cmd, directory, clone_from)
+                    agent = Agent(goal, driver, time_limit, self.get_client(), self.custom_tools, self.model, self.provider_order, first_command, stop_event, budget, directory)
+                    agent.run()
+                except Exception as e:
+                    print(f"\n[Attempt in {directory} failed: {e}]")
+                    result["status"] = "error"
+                    return
+                finally:
+                    if agent:
+                        result["tokens"] = agent.tokens_used
+                    # Stop the CLI before verifying so the workspace is no longer changing
+                    if driver:
+                        driver.terminate()
+
+                if stop_event.is_set():
+                    return
+                if not agent.exited and budget.exhausted():
+                    result["status"] = "budget"
+                    return
+
+                passed = self._verify(verifier, directory, verifier_timeout, stop_event)
+                with winner_lock:
+                    if not passed and stop_event.is_set():
+                        return
+                    if not passed:
+                        result["status"] = "failed"
+                        return
+                    result["status"] = "passed"
+                    if winner["directory"] is None:
+                        winner["directory"] = directory
+                        print(f"\n[Fleet winner: {directory} - cancelling other attempts]")
+                        stop_event.set()
+
+        threads = [threading.Thread(target=run_attempt, args=(result,)) for result in results]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return {"winner": winner["directory"], "attempts": results, "tokens": budget.used}
+
+    @staticmethod
+    def _verify(verifier, directory: str, timeout: Optional[int] = None, stop_event: Optional[threading.Event] = None) -> bool:
+        """Score a finished attempt with a shell command (exit code 0 passes) or a callable taking the directory.
+        Command verifiers are killed on timeout or once stop_event is set; callables run to completion."""
+        try:
+            if not isinstance(verifier, str):
+                return bool(verifier(directory))
+            proc = subprocess.Popen(verifier, shell=True, cwd=directory, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+            deadline = time.time() + timeout if timeout else None
+            while proc.poll() is None:
+                if stop_event and stop_event.is_set():
+                    os.killpg(proc.pid, signal.SIGKILL)
+                    proc.wait()
+                    return False
+                if deadline and time.time() >= deadline:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                    proc.wait()
+                    print(f"\n[Verifier timed out after {timeout}s in {directory}]")
+                    return False
+                time.sleep(0.1)
+            return proc.returncode == 0
+        except Exception as e:
+            print(f"\n[Verifier error in {directory}: {e}]")
+            return False
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import os
+from dotenv import load_dotenv
+from agentuse import AgentUse
+
+load_dotenv()
+
+def best_of_n_example():
+    """Example: Race several agents on the same goal, keep the first that passes tests"""
+    print("🏁 Running a fleet of agents...")
+    
+    agent = AgentUse(
+        api_key=os.environ.get("OPENROUTER_API_KEY"),
+        model="qwen/qwen3-32b",
+        provider_order=["Cerebras"]
+    )
+    
+    result = agent.run_fleet(
+        goal="Make all tests in this project pass",
+        verifier="python -m pytest -q",    # Exit code 0 = attempt passes
+        attempts=3,                        # Clone 3 workspaces
+        cli_cmd="claude",
+        clone_from="~/existing_project",   # Each attempt starts from this
+        base_directory="/tmp/fleet",       # attempt_1, attempt_2, ...
+        max_parallel=3,                    # Agents running at once
+        token_budget=200000,               # Shared across all attempts
+        first_command="/init",
+        time_limit=15
+    )
+    
+    for attempt in result["attempts"]:
+        print(f"{attempt['directory']}: {attempt['status']} ({attempt['tokens']} tokens)")
+    print(f"Winner: {result['winner']}")
+
+def custom_verifier_example():
+    """Example: Score attempts with a Python callable instead of a command"""
+    agent = AgentUse(api_key=os.environ.get("OPENROUTER_API_KEY"))
+    
+    def has_readme(directory: str) -> bool:
+        return os.path.exists(os.path.join(directory, "README.md"))
+    
+    agent.run_fleet(
+        goal="Write a README for this project",
+        verifier=has_readme,
+        attempts=2,
+        clone_from="~/existing_project"
+    )
+
+if __name__ == "__main__":
+    print("Fleet Examples")
+    print("==============")
+    
+    best_of_n_example()
+    # custom_verifier_example()
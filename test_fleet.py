@@ -0,0 +1,126 @@
+import os
+import time
+from types import SimpleNamespace
+import agentuse
+
+# Stub-based checks of run_fleet scheduling; no Terminal or LLM needed.
+
+class StubDriver:
+    created = []
+
+    def __init__(self, cmd, directory=None, clone_from=None):
+        self.directory = directory
+        self.terminated = False
+        StubDriver.created.append(self)
+
+    def terminate(self):
+        self.terminated = True
+
+    def close(self):
+        pass
+
+class FakeTerminalDriver(StubDriver):
+    """Driver whose screen shows an idle prompt, for exercising the real Agent.run loop"""
+    def read_screen(self):
+        return "$ ready"
+
+    def send_text(self, text):
+        pass
+
+class FakeClient:
+    """OpenAI-shaped client that always answers <wait/> and reports a fixed token usage"""
+    def __init__(self, tokens_per_call):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+        self.tokens_per_call = tokens_per_call
+
+    def create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content="<wait/>")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=SimpleNamespace(total_tokens=self.tokens_per_call))
+
+def stub_run(self):
+    """Attempt N works for N * 5 steps, spending 10 tokens per step, then writes its number to 'result'"""
+    n = int(self.driver.directory.rsplit("_", 1)[1])
+    for _ in range(n * 5):
+        if self.should_stop():
+            return
+        self.tokens_used += 10
+        self.budget.spend(10)
+        time.sleep(0.05)
+    with open(os.path.join(self.driver.directory, "result"), "w") as f:
+        f.write(str(n))
+    self.exited = True
+
+def make_fleet(monkeypatch):
+    StubDriver.created = []
+    monkeypatch.setattr(agentuse, "Driver", StubDriver)
+    monkeypatch.setattr(agentuse.Agent, "run", stub_run)
+    monkeypatch.setattr(agentuse.AgentUse, "get_client", lambda self: None)
+    return agentuse.AgentUse(api_key="test")
+
+def test_first_pass_cancels_the_rest(monkeypatch, tmp_path):
+    fleet = make_fleet(monkeypatch)
+    result = fleet.run_fleet("goal", verifier="grep -q 2 result", attempts=3, base_directory=str(tmp_path))
+
+    statuses = [a["status"] for a in result["attempts"]]
+    assert statuses == ["failed", "passed", "cancelled"]
+    assert result["winner"] == os.path.join(str(tmp_path), "attempt_2")
+    assert not os.path.exists(os.path.join(str(tmp_path), "attempt_3", "result"))
+    assert all(d.terminated for d in StubDriver.created)
+
+def test_queued_attempts_never_start(monkeypatch, tmp_path):
+    fleet = make_fleet(monkeypatch)
+    result = fleet.run_fleet("goal", verifier=lambda d: True, attempts=3, max_parallel=1, base_directory=str(tmp_path))
+
+    assert result["winner"] is not None
+    assert [a["status"] for a in result["attempts"]].count("passed") == 1
+    assert len(StubDriver.created) == 1
+
+def test_exhausted_budget_stops_attempts(monkeypatch, tmp_path):
+    fleet = make_fleet(monkeypatch)
+    result = fleet.run_fleet("goal", verifier=lambda d: True, attempts=3, max_parallel=1, token_budget=30, base_directory=str(tmp_path))
+
+    assert result["winner"] is None
+    assert [a["status"] for a in result["attempts"]] == ["budget", "cancelled", "cancelled"]
+    assert result["tokens"] == 30
+
+def test_driver_failure_is_reported_as_error(monkeypatch, tmp_path):
+    fleet = make_fleet(monkeypatch)
+
+    def broken_driver(*args, **kwargs):
+        raise RuntimeError("osascript not found")
+
+    monkeypatch.setattr(agentuse, "Driver", broken_driver)
+    result = fleet.run_fleet("goal", verifier=lambda d: True, attempts=2, base_directory=str(tmp_path))
+
+    assert [a["status"] for a in result["attempts"]] == ["error", "error"]
+    assert result["winner"] is None
+
+def test_verifier_timeout_fails_attempt(tmp_path):
+    assert agentuse.AgentUse._verify("sleep 5", str(tmp_path), timeout=1) is False
+
+def test_winner_kills_running_verifiers(monkeypatch, tmp_path):
+    fleet = make_fleet(monkeypatch)
+    start = time.time()
+    # attempt_1 finishes first and starts a slow failing verifier; attempt_2 then passes quickly
+    result = fleet.run_fleet("goal", verifier="grep -q 2 result || (sleep 5; exit 1)", attempts=2, base_directory=str(tmp_path))
+
+    assert time.time() - start < 3
+    assert [a["status"] for a in result["attempts"]] == ["cancelled", "passed"]
+
+def test_real_agent_loop_stops_when_budget_trips(monkeypatch, tmp_path):
+    StubDriver.created = []
+    client = FakeClient(tokens_per_call=40)
+    monkeypatch.setattr(agentuse, "Driver", FakeTerminalDriver)
+    monkeypatch.setattr(agentuse.AgentUse, "get_client", lambda self: client)
+    fleet = agentuse.AgentUse(api_key="test")
+
+    result = fleet.run_fleet("goal", verifier=lambda d: True, attempts=1, token_budget=100, base_directory=str(tmp_path))
+
+    # summarize (40) + ask (40) + ask (40) crosses 100, then the loop's should_stop check ends the run
+    assert result["attempts"][0]["status"] == "budget"
+    assert result["attempts"][0]["tokens"] == 120
+    assert result["tokens"] == 120
+    assert client.calls == 3
+    assert StubDriver.created[0].terminated